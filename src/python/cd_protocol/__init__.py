@@ -1,7 +1,23 @@
 import struct
+import sys
 from dataclasses import dataclass
 from enum import IntEnum
-from typing import Optional, List, Tuple
+from typing import (
+    TYPE_CHECKING,
+    ClassVar,
+    Final,
+    Optional,
+    List,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Payload/frame dataclasses get __slots__ where supported (3.10+): no
+# per-instance __dict__, faster field access in pack/unpack.
+_DATACLASS_OPTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 # === 1. CONSTANTS ===
 HU_PROTOCOL_MAGIC = 0xA5
@@ -61,6 +77,37 @@ class MsgType(IntEnum):
     DATA_SCALE = 0x32
 
 
+# Plain-int mirrors for hot-path dispatch. MeshFrame fields are plain ints,
+# so `frame.msg_type == MSG_PING` is an int == int compare; the enums stay
+# the public/documented API.
+ADDR_COORDINATOR: Final = 0x01
+ADDR_BROADCAST: Final = 0xFF
+ADDR_UNASSIGNED: Final = 0xFE
+
+MSG_PING: Final = 0x01
+MSG_ACK: Final = 0x02
+MSG_ERROR: Final = 0x03
+MSG_SYS_DISCOVERY_REQ: Final = 0x05
+MSG_SYS_DISCOVERY_RES: Final = 0x06
+MSG_SYS_ASSIGN_ID: Final = 0x07
+MSG_SYS_REBOOT: Final = 0x08
+MSG_CMD_SET_STATE: Final = 0x10
+MSG_CMD_PROFILE_LOAD: Final = 0x11
+MSG_CMD_HAPTIC_CFG: Final = 0x12
+MSG_CMD_UI_WIDGET: Final = 0x13
+MSG_CMD_UI_MENU: Final = 0x14
+MSG_EVENT_UI_INPUT: Final = 0x20
+MSG_EVENT_CRITICAL: Final = 0x21
+MSG_EVENT_FLOW_START: Final = 0x22
+MSG_DATA_SENSOR: Final = 0x30
+MSG_DATA_MULTI: Final = 0x31
+MSG_DATA_SCALE: Final = 0x32
+
+# Import-time guard: mirrors must match the enums
+assert all(globals()[f"ADDR_{_a.name}"] == _a for _a in DeviceAddress)
+assert all(globals()[f"MSG_{_m.name}"] == _m for _m in MsgType)
+
+
 # === 4. ENUMS ===
 class Priority(IntEnum):
     FLOW_IN = 0
@@ -94,8 +141,22 @@ class InputEvent(IntEnum):
 
 # === 5. PAYLOAD STRUCTURES ===
 
+# Any readable byte buffer: payload unpackers take MeshFrame.payload as-is.
+# MeshFrame.unpack slices keep the input type, so a memoryview in gives
+# zero-copy memoryview payload/remaining out.
+_Buffer = Union[bytes, bytearray, memoryview]
+
 
-@dataclass
+def _u8(x: float) -> int:
+    # Round half up, saturate to 0..255 (spec 6.1). Callers pass value / LSB.
+    if x <= 0:
+        return 0
+    if x >= 255:
+        return 255
+    return int(x + 0.5)
+
+
+@dataclass(**_DATACLASS_OPTS)
 class PayloadDiscoveryRes:
     device_type: int
     hw_revision: int
@@ -103,23 +164,27 @@ class PayloadDiscoveryRes:
     fw_minor: int
     current_id: int
 
+    _STRUCT: ClassVar[struct.Struct] = struct.Struct("<BBBBB")
+
     @classmethod
-    def unpack(cls, data: bytes):
-        if len(data) < 5:
+    def unpack(cls, data: _Buffer) -> Optional["PayloadDiscoveryRes"]:
+        if len(data) < cls._STRUCT.size:
             return None
-        return cls(*struct.unpack("<BBBBB", data[:5]))
+        return cls(*cls._STRUCT.unpack_from(data, 0))
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class PayloadAssignID:
     target_mac: bytes  # 6 bytes
     new_logical_id: int
 
+    _STRUCT: ClassVar[struct.Struct] = struct.Struct("<6sB")
+
     def pack(self) -> bytes:
-        return struct.pack("<6sB", self.target_mac, self.new_logical_id)
+        return self._STRUCT.pack(self.target_mac, self.new_logical_id)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class PayloadProfileNode:
     time_offset_ms: int
     priority: int  # Enum Priority
@@ -142,106 +207,181 @@ class PayloadProfileNode:
     energy_target: int  # 0-255
     energy_tol: int
 
+    _STRUCT: ClassVar[struct.Struct] = struct.Struct("<HB BBBBBBBBBB")
+
     def pack(self) -> bytes:
+        return self._STRUCT.pack(*self._wire_values())
+
+    def pack_into(self, buf: bytearray, offset: int) -> int:
+        self._STRUCT.pack_into(buf, offset, *self._wire_values())
+        return self._STRUCT.size
+
+    def _wire_values(self) -> Tuple[int, ...]:
         # 1. Config Flags: Bits 0-1 (Interp), Bits 2-3 (Prio)
         config = (self.interpolation & 0x03) | ((self.priority & 0x03) << 2)
 
-        # 2. Scaling helper
-        def _s(val, factor):
-            i = int(round(val / factor))
-            return max(0, min(255, i))
-
-        # 3. Pack: H (time) B (flags) 10B (targets/tols)
-        return struct.pack(
-            "<HB BBBBBBBBBB",
+        # 2. Layout: H (time) B (flags) 10B (targets/tols)
+        return (
             self.time_offset_ms,
             config,
-            _s(self.temp_target, 0.5),
-            _s(self.temp_tol, 0.5),
-            _s(self.press_target, 0.1),
-            _s(self.press_tol, 0.1),
-            _s(self.flow_in_target, 0.1),
-            _s(self.flow_in_tol, 0.1),
-            _s(self.flow_out_target, 0.1),
-            _s(self.flow_out_tol, 0.1),
-            _s(self.energy_target, 1),
-            _s(self.energy_tol, 1),
+            # 1 LSB = 0.5 C / 0.1 Bar / 0.1 ml/s: multiply, never divide
+            _u8(self.temp_target * 2),
+            _u8(self.temp_tol * 2),
+            _u8(self.press_target * 10),
+            _u8(self.press_tol * 10),
+            _u8(self.flow_in_target * 10),
+            _u8(self.flow_in_tol * 10),
+            _u8(self.flow_out_target * 10),
+            _u8(self.flow_out_tol * 10),
+            _u8(self.energy_target),
+            _u8(self.energy_tol),
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class PayloadProfileLoad:
     profile_id: int
     nodes: List[PayloadProfileNode]
 
+    _STRUCT: ClassVar[struct.Struct] = struct.Struct("<BB")
+
     def pack(self) -> bytes:
         if len(self.nodes) > 17:
             raise ValueError(f"Too many nodes: {len(self.nodes)} > 17")
 
-        payload = struct.pack("<BB", self.profile_id, len(self.nodes))
+        # Size is known up front: header + 13 bytes per node, one buffer
+        size = self._STRUCT.size + PayloadProfileNode._STRUCT.size * len(self.nodes)
+        out = bytearray(size)
+        self._STRUCT.pack_into(out, 0, self.profile_id, len(self.nodes))
+        offset = self._STRUCT.size
         for node in self.nodes:
-            payload += node.pack()
-        return payload
+            offset += node.pack_into(out, offset)
+        return bytes(out)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class PayloadHapticConfig:
     mode: int
     strength: int
     param_1: int
     param_2: int
 
+    _STRUCT: ClassVar[struct.Struct] = struct.Struct("<BBhh")
+
     def pack(self) -> bytes:
-        return struct.pack(
-            "<BBhh", self.mode, self.strength, self.param_1, self.param_2
-        )
+        return self._STRUCT.pack(self.mode, self.strength, self.param_1, self.param_2)
+
+
+# numpy structured dtype fields with the same packed 11-byte wire layout
+_SCALE_DTYPE_FIELDS = [
+    ("timestamp_ms", "<u4"),
+    ("weight_mg", "<i4"),
+    ("flow_mg_s", "<i2"),
+    ("status", "u1"),
+]
+_scale_dtype: Optional["np.dtype[np.void]"] = None
 
 
-@dataclass
+def scale_dtype() -> "np.dtype[np.void]":
+    """numpy dtype of one PayloadScaleData sample, built on first use.
+
+    Requires the optional numpy dependency (`cd_protocol[numpy]`).
+    """
+    global _scale_dtype
+    if _scale_dtype is None:
+        import numpy as np
+
+        _scale_dtype = np.dtype(_SCALE_DTYPE_FIELDS)
+    return _scale_dtype
+
+
+@dataclass(**_DATACLASS_OPTS)
 class PayloadScaleData:
     timestamp_ms: int
     weight_mg: int
     flow_mg_s: int
     status: int
 
+    _STRUCT: ClassVar[struct.Struct] = struct.Struct("<IihB")
+
     @classmethod
-    def unpack(cls, data: bytes):
-        if len(data) < 11:
+    def unpack(cls, data: _Buffer) -> Optional["PayloadScaleData"]:
+        if len(data) < cls._STRUCT.size:
             return None
-        return cls(*struct.unpack("<IihB", data[:11]))
+        return cls(*cls._STRUCT.unpack_from(data, 0))
 
+    @classmethod
+    def unpack_batch(cls, data: _Buffer, count: int = -1) -> "np.ndarray":
+        """Zero-copy numpy view over back-to-back samples (SoA columns).
+
+        Requires the optional numpy dependency (`cd_protocol[numpy]`).
+        Columns are addressed by field name, e.g. ``arr["weight_mg"]``.
+        """
+        import numpy as np
+
+        return np.frombuffer(data, dtype=scale_dtype(), count=count)
 
-@dataclass
+
+@dataclass(**_DATACLASS_OPTS)
 class PayloadInputEvent:
     source_index: int
     event_type: int
     value: int
 
+    _STRUCT: ClassVar[struct.Struct] = struct.Struct("<BBi")
+
     @classmethod
-    def unpack(cls, data: bytes):
-        if len(data) < 6:
+    def unpack(cls, data: _Buffer) -> Optional["PayloadInputEvent"]:
+        if len(data) < cls._STRUCT.size:
             return None
-        return cls(*struct.unpack("<BBi", data[:6]))
+        return cls(*cls._STRUCT.unpack_from(data, 0))
 
 
 # === 6. MAIN FRAME ===
 
 _HEADER_STRUCT = struct.Struct("<BBBBBBHB")
 
-
-@dataclass
+_RESYNC_WINDOW = 256
+
+
+def _find_magic(data: _Buffer, start: int) -> int:
+    if not isinstance(data, memoryview):
+        return data.find(HU_PROTOCOL_MAGIC, start)
+
+    # memoryview has no find(). A view over a whole bytes/bytearray can
+    # search the owner in place; anything else is scanned in bounded
+    # windows, so a resync copies at most one window past the next magic.
+    obj = data.obj
+    if (
+        isinstance(obj, (bytes, bytearray))
+        and data.contiguous
+        and data.nbytes == len(obj)
+    ):
+        return obj.find(HU_PROTOCOL_MAGIC, start)
+    end = len(data)
+    while start < end:
+        idx = bytes(data[start : start + _RESYNC_WINDOW]).find(HU_PROTOCOL_MAGIC)
+        if idx >= 0:
+            return start + idx
+        start += _RESYNC_WINDOW
+    return -1
+
+
+@dataclass(**_DATACLASS_OPTS)
 class MeshFrame:
     src_id: int
     dst_id: int
     msg_type: int
-    payload: bytes = b""
+    payload: _Buffer = b""
     via_id: int = 0
     seq_num: int = 0
     flags: int = 0
 
     def pack(self) -> bytes:
-        if len(self.payload) > HU_MAX_PAYLOAD_SIZE:
-            raise ValueError(f"Payload too large: {len(self.payload)}")
+        payload = self.payload
+        p_len = len(payload)
+        if p_len > HU_MAX_PAYLOAD_SIZE:
+            raise ValueError(f"Payload too large: {p_len}")
 
         header = _HEADER_STRUCT.pack(
             HU_PROTOCOL_MAGIC,
@@ -251,21 +391,59 @@ class MeshFrame:
             self.via_id,
             self.msg_type,
             self.seq_num,
-            len(self.payload),
+            p_len,
+        )
+        # PING/ACK & co: the header is the whole frame
+        return header + payload if p_len else header
+
+    def pack_into(self, out: Union[bytearray, memoryview], offset: int = 0) -> int:
+        """Write the frame into a caller-owned buffer; returns bytes written.
+
+        For reusable TX buffers; pack() builds its bytes independently.
+        """
+        p_len = len(self.payload)
+        if p_len > HU_MAX_PAYLOAD_SIZE:
+            raise ValueError(f"Payload too large: {p_len}")
+        total_len = HEADER_SIZE + p_len
+        if offset < 0:
+            raise ValueError(f"Negative offset: {offset}")
+        if len(out) - offset < total_len:
+            raise ValueError(f"Buffer too small: need {total_len} at {offset}")
+
+        _HEADER_STRUCT.pack_into(
+            out,
+            offset,
+            HU_PROTOCOL_MAGIC,
+            self.flags,
+            self.src_id,
+            self.dst_id,
+            self.via_id,
+            self.msg_type,
+            self.seq_num,
+            p_len,
         )
-        return header + self.payload
+        out[offset + HEADER_SIZE : offset + total_len] = self.payload
+        return total_len
+
+    def payload_bytes(self) -> bytes:
+        """Payload as bytes, copying only if it is not bytes already."""
+        if isinstance(self.payload, bytes):
+            return self.payload
+        return bytes(self.payload)
 
     @classmethod
-    def unpack(cls, data: bytes) -> Tuple[Optional["MeshFrame"], bytes]:
+    def unpack(cls, data: _Buffer) -> Tuple[Optional["MeshFrame"], _Buffer]:
         if len(data) < HEADER_SIZE:
             return None, data
 
-        magic, flags, src, dst, via, msg_type, seq, p_len = _HEADER_STRUCT.unpack(
-            data[:HEADER_SIZE]
+        magic, flags, src, dst, via, msg_type, seq, p_len = _HEADER_STRUCT.unpack_from(
+            data, 0
         )
 
         if magic != HU_PROTOCOL_MAGIC:
-            return None, data[1:]
+            # Resync: skip straight to the next magic candidate (or drop all)
+            idx = _find_magic(data, 1)
+            return None, (data[idx:] if idx >= 0 else data[:0])
 
         total_len = HEADER_SIZE + p_len
         if len(data) < total_len:
@@ -275,9 +453,54 @@ class MeshFrame:
             src_id=src,
             dst_id=dst,
             msg_type=msg_type,
-            payload=data[HEADER_SIZE:total_len],
+            # PING/ACK etc.: share the immutable b"" instead of an empty slice
+            payload=data[HEADER_SIZE:total_len] if p_len else b"",
             via_id=via,
             seq_num=seq,
             flags=flags,
         )
         return frame, data[total_len:]
+
+    @classmethod
+    def unpack_batch(cls, data: _Buffer) -> Tuple[List["MeshFrame"], _Buffer]:
+        """Unpack every complete frame in data; returns (frames, remaining).
+
+        Same framing/resync rules as unpack(), but walks the buffer by
+        offset, so a backlog of N frames costs one remaining-slice, not N.
+        """
+        frames: List["MeshFrame"] = []
+        append = frames.append
+        unpack_from = _HEADER_STRUCT.unpack_from
+        magic_byte = HU_PROTOCOL_MAGIC
+        header_size = HEADER_SIZE
+        end = len(data)
+        pos = 0
+
+        while end - pos >= header_size:
+            magic, flags, src, dst, via, msg_type, seq, p_len = unpack_from(data, pos)
+
+            if magic != magic_byte:
+                pos = _find_magic(data, pos + 1)
+                if pos < 0:
+                    return frames, data[:0]
+                continue
+
+            start = pos + header_size
+            total_end = start + p_len
+            if total_end > end:
+                break
+
+            append(
+                cls(
+                    src_id=src,
+                    dst_id=dst,
+                    msg_type=msg_type,
+                    payload=data[start:total_end] if p_len else b"",
+                    via_id=via,
+                    seq_num=seq,
+                    flags=flags,
+                )
+            )
+            pos = total_end
+
+        return frames, data[pos:]
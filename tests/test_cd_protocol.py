@@ -0,0 +1,366 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+import cd_protocol
+import pytest
+from cd_protocol import (
+    HEADER_SIZE,
+    HU_MAX_PAYLOAD_SIZE,
+    DeviceAddress,
+    Interpolation,
+    MeshFrame,
+    MsgType,
+    PayloadDiscoveryRes,
+    PayloadInputEvent,
+    PayloadProfileLoad,
+    PayloadProfileNode,
+    PayloadScaleData,
+    Priority,
+    scale_dtype,
+)
+
+BUFFER_TYPES = [bytes, bytearray, memoryview]
+
+
+PING = MeshFrame(src_id=0x10, dst_id=0x01, msg_type=MsgType.PING, seq_num=300)
+DATA = MeshFrame(
+    src_id=0x20,
+    dst_id=0x01,
+    msg_type=MsgType.DATA_SCALE,
+    payload=bytes(range(11)),
+    via_id=0x05,
+    seq_num=7,
+    flags=0x01,
+)
+
+
+def _node(**overrides):
+    values = {
+        "time_offset_ms": 1000,
+        "priority": Priority.PRESSURE,
+        "interpolation": Interpolation.SPLINE,
+        "temp_target": 93.5,
+        "temp_tol": 1.0,
+        "press_target": 9.0,
+        "press_tol": 0.5,
+        "flow_in_target": 2.5,
+        "flow_in_tol": 0.2,
+        "flow_out_target": 1.5,
+        "flow_out_tol": 0.3,
+        "energy_target": 200,
+        "energy_tol": 3,
+    }
+    values.update(overrides)
+    return PayloadProfileNode(**values)
+
+
+def _fields(frame):
+    return (
+        frame.src_id,
+        frame.dst_id,
+        frame.msg_type,
+        bytes(frame.payload),
+        frame.via_id,
+        frame.seq_num,
+        frame.flags,
+    )
+
+
+def _unpack_all(data):
+    frames = []
+    while True:
+        frame, rest = MeshFrame.unpack(data)
+        if frame is None and len(rest) == len(data):
+            return frames, rest
+        if frame is not None:
+            frames.append(frame)
+        data = rest
+
+
+# === PROFILE ENCODING ===
+
+
+def test_profile_node_bytes():
+    assert _node().pack() == bytes.fromhex("e803 05 bb 02 5a 05 19 02 0f 03 c8 03")
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (9.0, 90),
+        (9.95, 100),
+        (0.35, 4),
+        (0.25, 3),
+        (0.05, 1),
+        (0.04, 0),
+        (25.46, 255),
+        (30.0, 255),
+        (-1.0, 0),
+    ],
+)
+def test_profile_node_press_flow_scaling(value, expected):
+    packed = _node(press_target=value, flow_out_tol=value).pack()
+    assert packed[5] == expected  # press_target
+    assert packed[10] == expected  # flow_out_tol
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [(93.5, 187), (92.25, 185), (0.2, 0), (127.5, 255), (200.0, 255), (-3.0, 0)],
+)
+def test_profile_node_temp_scaling(value, expected):
+    assert _node(temp_target=value).pack()[3] == expected
+
+
+@pytest.mark.parametrize(("field", "mul"), [("temp_target", 2), ("press_target", 10)])
+def test_profile_node_rounds_decimal_half_up(field, mul):
+    # Every 2-decimal input encodes as its decimal value rounded half up
+    index = 3 if field == "temp_target" else 5
+    for hundredths in range(2601):
+        scaled = Decimal(hundredths) * mul / 100
+        expected = min(255, int(scaled.quantize(Decimal(1), ROUND_HALF_UP)))
+        packed = _node(**{field: hundredths / 100}).pack()
+        assert packed[index] == expected, hundredths / 100
+
+
+def test_profile_node_energy_is_saturated():
+    packed = _node(energy_target=300, energy_tol=-5).pack()
+    assert packed[11:13] == bytes([255, 0])
+
+
+def test_profile_node_config_flags():
+    packed = _node(priority=Priority.ENERGY, interpolation=Interpolation.STEP).pack()
+    assert packed[2] == 0x02 | (0x03 << 2)
+
+
+def test_profile_load_layout():
+    node = _node()
+    payload = PayloadProfileLoad(profile_id=7, nodes=[node, node]).pack()
+    assert payload == bytes([7, 2]) + node.pack() * 2
+
+
+def test_profile_load_rejects_too_many_nodes():
+    with pytest.raises(ValueError, match="Too many nodes"):
+        PayloadProfileLoad(profile_id=1, nodes=[_node()] * 18).pack()
+
+
+# === MESH FRAME ===
+
+
+def test_pack_layout():
+    assert PING.pack() == bytes.fromhex("a5 00 10 01 00 01 2c01 00")
+    assert DATA.pack() == bytes.fromhex("a5 01 20 01 05 32 0700 0b") + DATA.payload
+
+
+@pytest.mark.parametrize("frame", [PING, DATA])
+def test_pack_unpack_round_trip(frame):
+    parsed, rest = MeshFrame.unpack(frame.pack())
+    assert _fields(parsed) == _fields(frame)
+    assert rest == b""
+
+
+def test_pack_rejects_oversized_payload():
+    frame = MeshFrame(1, 2, 3, payload=bytes(HU_MAX_PAYLOAD_SIZE + 1))
+    with pytest.raises(ValueError, match="Payload too large"):
+        frame.pack()
+    MeshFrame(1, 2, 3, payload=bytes(HU_MAX_PAYLOAD_SIZE)).pack()
+
+
+@pytest.mark.parametrize("kind", BUFFER_TYPES)
+@pytest.mark.parametrize("frame", [PING, DATA])
+def test_unpack_round_trip_any_buffer(kind, frame):
+    parsed, rest = MeshFrame.unpack(kind(frame.pack()))
+    assert _fields(parsed) == _fields(frame)
+    assert parsed.payload_bytes() == frame.payload
+    assert type(parsed.payload_bytes()) is bytes
+    assert len(rest) == 0
+    assert type(rest) is kind
+
+
+@pytest.mark.parametrize("kind", BUFFER_TYPES)
+def test_slice_types_follow_input(kind):
+    parsed, rest = MeshFrame.unpack(kind(DATA.pack() + b"\xa5"))
+    assert type(parsed.payload) is kind
+    assert type(rest) is kind
+    assert bytes(rest) == b"\xa5"
+
+
+@pytest.mark.parametrize("kind", BUFFER_TYPES)
+def test_unpack_incomplete_keeps_buffer(kind):
+    data = kind(DATA.pack()[:-1])
+    frame, rest = MeshFrame.unpack(data)
+    assert frame is None
+    assert rest is data
+
+
+@pytest.mark.parametrize("kind", BUFFER_TYPES)
+def test_unpack_zero_payload_shares_empty_bytes(kind):
+    parsed, _ = MeshFrame.unpack(kind(PING.pack()))
+    assert type(parsed.payload) is bytes
+    assert parsed.payload == b""
+
+
+@pytest.mark.parametrize("kind", BUFFER_TYPES)
+def test_unpack_resyncs_to_next_magic(kind):
+    garbage = bytes(300) + b"\x01\x02"
+    frame, rest = MeshFrame.unpack(kind(garbage + PING.pack()))
+    assert frame is None
+    assert bytes(rest) == PING.pack()
+
+
+@pytest.mark.parametrize("kind", BUFFER_TYPES)
+def test_unpack_resync_drops_buffer_without_magic(kind):
+    frame, rest = MeshFrame.unpack(kind(bytes(600)))
+    assert frame is None
+    assert len(rest) == 0
+    assert type(rest) is kind
+
+
+@pytest.mark.parametrize("kind", BUFFER_TYPES)
+def test_resync_over_garbage_between_frames(kind):
+    stream = b"\x00\x01" + DATA.pack() + bytes(500) + PING.pack() + b"\xa5\x00"
+    frames, rest = _unpack_all(kind(stream))
+    assert [_fields(f) for f in frames] == [_fields(DATA), _fields(PING)]
+    assert bytes(rest) == b"\xa5\x00"
+
+
+@pytest.mark.parametrize("kind", BUFFER_TYPES)
+def test_resync_in_sliced_memoryview(kind):
+    owner = kind(b"\xa5" + bytes(400) + PING.pack())
+    view = memoryview(owner)[1:]
+    frame, rest = MeshFrame.unpack(view)
+    assert frame is None
+    assert bytes(rest) == PING.pack()
+
+
+@pytest.mark.parametrize("kind", BUFFER_TYPES)
+def test_unpack_batch_matches_repeated_unpack(kind):
+    stream = (
+        bytes(3)
+        + PING.pack()
+        + DATA.pack()
+        + b"\x11" * 700
+        + DATA.pack()
+        + PING.pack()[:5]
+    )
+    expected, expected_rest = _unpack_all(kind(stream))
+    frames, rest = MeshFrame.unpack_batch(kind(stream))
+    assert [_fields(f) for f in frames] == [_fields(f) for f in expected]
+    assert len(frames) == 3
+    assert type(rest) is kind
+    assert bytes(rest) == bytes(expected_rest)
+
+
+def test_unpack_batch_without_magic_drops_all():
+    frames, rest = MeshFrame.unpack_batch(bytearray(50))
+    assert frames == []
+    assert rest == bytearray()
+
+
+def test_pack_into_writes_at_offset():
+    out = bytearray(40)
+    written = DATA.pack_into(out, 5)
+    assert written == HEADER_SIZE + len(DATA.payload)
+    assert out[5 : 5 + written] == DATA.pack()
+    assert out[:5] == bytes(5)
+    assert out[5 + written :] == bytes(40 - 5 - written)
+    assert len(out) == 40
+
+
+@pytest.mark.parametrize("kind", BUFFER_TYPES)
+@pytest.mark.parametrize("size", [0, 1, 11, HU_MAX_PAYLOAD_SIZE])
+def test_pack_into_matches_pack(kind, size):
+    frame = MeshFrame(1, 2, 3, payload=kind(bytes(range(size))), seq_num=0xBEEF)
+    out = bytearray(HEADER_SIZE + size)
+    assert frame.pack_into(out) == len(out)
+    assert bytes(out) == frame.pack()
+
+
+def test_pack_into_memoryview():
+    out = bytearray(HEADER_SIZE)
+    assert PING.pack_into(memoryview(out)) == HEADER_SIZE
+    assert bytes(out) == PING.pack()
+
+
+@pytest.mark.parametrize(("size", "offset"), [(19, 0), (25, 6), (8, 0), (20, 21)])
+def test_pack_into_rejects_short_buffer(size, offset):
+    out = bytearray(size)
+    with pytest.raises(ValueError, match="Buffer too small"):
+        DATA.pack_into(out, offset)
+    assert len(out) == size
+
+
+def test_pack_into_rejects_negative_offset():
+    out = bytearray(20)
+    with pytest.raises(ValueError, match="Negative offset"):
+        DATA.pack_into(out, -12)
+    assert out == bytearray(20)
+
+
+# === PAYLOADS ===
+
+
+def test_payload_unpackers():
+    assert PayloadScaleData.unpack(DATA.payload) == PayloadScaleData(
+        timestamp_ms=0x03020100, weight_mg=0x07060504, flow_mg_s=0x0908, status=10
+    )
+    assert PayloadInputEvent.unpack(b"\x01\x04\xff\xff\xff\xff") == (
+        PayloadInputEvent(source_index=1, event_type=4, value=-1)
+    )
+    assert PayloadDiscoveryRes.unpack(b"\x20\x01\x00\x02\xfe") == (
+        PayloadDiscoveryRes(0x20, 1, 0, 2, 0xFE)
+    )
+
+
+def test_payload_unpackers_reject_short_data():
+    assert PayloadScaleData.unpack(bytes(10)) is None
+    assert PayloadInputEvent.unpack(bytes(5)) is None
+    assert PayloadDiscoveryRes.unpack(bytes(4)) is None
+
+
+@pytest.mark.parametrize("kind", [bytearray, memoryview])
+def test_payload_unpackers_accept_any_buffer(kind):
+    data = DATA.payload + b"\x01\x04\xff\xff\xff\xff"
+    assert PayloadScaleData.unpack(kind(data)) == PayloadScaleData.unpack(data)
+    assert PayloadInputEvent.unpack(kind(data[11:])) == (
+        PayloadInputEvent(source_index=1, event_type=4, value=-1)
+    )
+    assert PayloadDiscoveryRes.unpack(kind(data)) == PayloadDiscoveryRes(0, 1, 2, 3, 4)
+
+
+def test_scale_unpack_batch_is_columnar_view():
+    np = pytest.importorskip("numpy")
+    samples = [(1000 + i, -i * 250, i * 3, i % 2) for i in range(4)]
+    data = b"".join(PayloadScaleData._STRUCT.pack(*s) for s in samples)
+
+    arr = PayloadScaleData.unpack_batch(memoryview(data))
+    assert isinstance(arr, np.ndarray)
+    assert arr.dtype.itemsize == PayloadScaleData._STRUCT.size
+    assert arr["weight_mg"].tolist() == [s[1] for s in samples]
+    assert arr["status"].tolist() == [s[3] for s in samples]
+    assert tuple(arr[2].item()) == samples[2]
+    assert not arr.flags.owndata
+    assert PayloadScaleData.unpack_batch(data, count=2).shape == (2,)
+    with pytest.raises(ValueError, match="buffer size"):
+        PayloadScaleData.unpack_batch(data[:-1])
+
+
+def test_scale_dtype_is_cached():
+    pytest.importorskip("numpy")
+    dtype = scale_dtype()
+    assert scale_dtype() is dtype
+    assert dtype.itemsize == PayloadScaleData._STRUCT.size
+    assert PayloadScaleData.unpack_batch(b"").dtype is dtype
+
+
+# === CONSTANTS ===
+
+
+def test_int_mirrors_match_enums():
+    for msg in MsgType:
+        value = getattr(cd_protocol, f"MSG_{msg.name}")
+        assert value == msg
+        assert type(value) is int
+    for addr in DeviceAddress:
+        value = getattr(cd_protocol, f"ADDR_{addr.name}")
+        assert value == addr
+        assert type(value) is int